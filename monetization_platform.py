@@ -4,36 +4,104 @@ SkyReels Monetization Platform - User accounts, credits, and billing
 
 import os
 import json
+import time
+import base64
+import logging
+import hmac
 import stripe
 import jwt
 import hashlib
+import random
 import secrets
+import functools
 from datetime import datetime, timedelta
+from enum import Enum
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from types import MappingProxyType
 import asyncio
+import uuid
+import aiohttp
 import aioredis
-from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi import FastAPI, HTTPException, Depends, Header, Query
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import create_engine, Column, String, Float, Integer, DateTime, Boolean, Text
+from sqlalchemy import event, select, func, insert, update, text, Column, String, Float, Integer, DateTime, Boolean, Text, Index
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
 import boto3
 
+logger = logging.getLogger("sysrai.platform")
+
+try:
+    # Install before the app is built so uvicorn's "auto" loop resolves
+    # to uvloop's C event loop
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback keeps the platform runnable
+    orjson = None
+
+try:
+    from blake3 import blake3
+except ImportError:  # blake2b is the stdlib stand-in
+    blake3 = None
+
+
+def _hex_tokens(*sizes: int) -> List[str]:
+    """Slice several hex tokens out of a single CSPRNG read
+
+    Each secrets.token_hex call is its own getrandom syscall; callers
+    needing multiple tokens per request batch them through one read.
+    """
+    buf = os.urandom(sum(sizes))
+    tokens, offset = [], 0
+    for size in sizes:
+        tokens.append(buf[offset:offset + size].hex())
+        offset += size
+    return tokens
+
+
+@functools.lru_cache(maxsize=4096)
+def _project_cost(duration_minutes: int, include_script: bool,
+                  include_storyboard: bool, quality: str) -> Dict:
+    """Memoized project cost - the input space is tiny, so repeated
+    quotes for the same shape skip the pricing arithmetic entirely."""
+    from skyreels_film_platform import PricingEngine
+    return PricingEngine.calculate_project_cost(
+        duration_minutes=duration_minutes,
+        include_script=include_script,
+        include_storyboard=include_storyboard,
+        quality=quality
+    )
+
+
+def _json_dumps_bytes(obj) -> bytes:
+    """Serialize to JSON bytes, preferring orjson's C implementation"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
 # Database models
 Base = declarative_base()
 
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(String, primary_key=True)
+    id = Column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
     email = Column(String, unique=True, index=True)
     password_hash = Column(String)
     credits = Column(Float, default=0.0)
     subscription_tier = Column(String, default="free")  # free, starter, pro, enterprise
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_login = Column(DateTime)
     total_spent = Column(Float, default=0.0)
     referral_code = Column(String, unique=True)
@@ -44,35 +112,45 @@ class User(Base):
 class Project(Base):
     __tablename__ = "projects"
     
-    id = Column(String, primary_key=True)
+    id = Column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
     user_id = Column(String, index=True)
     title = Column(String)
     duration_minutes = Column(Integer)
     format = Column(String)  # film, series, short
-    status = Column(String)  # draft, queued, generating, complete, failed
+    status = Column(String, index=True)  # draft, queued, generating, complete, failed
     cost = Column(Float)
     credits_used = Column(Float)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime, nullable=True)
     film_url = Column(String, nullable=True)
-    metadata = Column(Text)  # JSON string
-    
+    # Attribute renamed so it no longer shadows Base.metadata (the
+    # declarative MetaData registry); the column name stays "metadata"
+    extra_metadata = Column("metadata", Text)  # JSON string
+
+    # Composite indexes: (user_id, id) makes keyset pagination one
+    # index range scan; (user_id, created_at) covers recency-ordered
+    # listings without a filesort
+    __table_args__ = (
+        Index('ix_projects_user_id_id', 'user_id', 'id'),
+        Index('ix_projects_user_created', 'user_id', 'created_at'),
+    )
+
 class Transaction(Base):
     __tablename__ = "transactions"
     
-    id = Column(String, primary_key=True)
+    id = Column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
     user_id = Column(String, index=True)
     type = Column(String)  # purchase, usage, refund, bonus
     amount = Column(Float)
     credits = Column(Float)
     description = Column(String)
     stripe_payment_id = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class GPUNode(Base):
     __tablename__ = "gpu_nodes"
     
-    id = Column(String, primary_key=True)
+    id = Column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
     provider = Column(String)  # runpod, vast, lambda
     instance_id = Column(String)
     gpu_type = Column(String)  # rtx4090, a100_40gb, a100_80gb, h100
@@ -81,11 +159,57 @@ class GPUNode(Base):
     current_project_id = Column(String, nullable=True)
     performance_score = Column(Float, default=1.0)
     region = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_health_check = Column(DateTime)
 
+    # Covers the "best available node" lookup in assign_project_to_node;
+    # the partial index keeps scale_up's availability count an
+    # index-only scan sized to the available subset, not the fleet
+    __table_args__ = (
+        Index('ix_gpu_avail', 'status', 'gpu_type',
+              'performance_score', 'hourly_cost'),
+        Index('ix_gpu_available', 'status',
+              sqlite_where=text("status = 'available'"),
+              postgresql_where=text("status = 'available'")),
+    )
+
 
 # Platform configuration
+class TierName(str, Enum):
+    """Valid subscription tiers"""
+    FREE = "free"
+    STARTER = "starter"
+    PRO = "pro"
+    ENTERPRISE = "enterprise"
+
+
+class PackageName(str, Enum):
+    """Valid credit packages"""
+    SMALL = "small"
+    MEDIUM = "medium"
+    LARGE = "large"
+    MEGA = "mega"
+
+
+@dataclass(frozen=True, slots=True)
+class Tier:
+    """Subscription tier pricing and limits"""
+    monthly_price: float
+    included_credits: int
+    price_per_minute: float
+    max_duration_minutes: int
+    priority: int
+    features: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class CreditPackage:
+    """Purchasable credit bundle"""
+    credits: int
+    price: float
+    bonus: int
+
+
 class PlatformConfig:
     """Platform configuration and pricing"""
     
@@ -98,115 +222,242 @@ class PlatformConfig:
     JWT_ALGORITHM = "HS256"
     JWT_EXPIRATION_HOURS = 24
     
-    # Pricing tiers
+    # Pricing tiers - frozen slot instances, so hot-path reads like
+    # tier.price_per_minute are fixed-offset attribute loads instead of
+    # nested dict lookups hashing the key each time
     SUBSCRIPTION_TIERS = {
-        "free": {
-            "monthly_price": 0,
-            "included_credits": 10,
-            "price_per_minute": 5.00,  # Higher price for free tier
-            "max_duration_minutes": 10,
-            "priority": 0,
-            "features": ["basic_quality", "watermark"]
-        },
-        "starter": {
-            "monthly_price": 29.99,
-            "included_credits": 100,
-            "price_per_minute": 3.00,
-            "max_duration_minutes": 60,
-            "priority": 1,
-            "features": ["standard_quality", "no_watermark", "downloads"]
-        },
-        "pro": {
-            "monthly_price": 99.99,
-            "included_credits": 500,
-            "price_per_minute": 2.50,
-            "max_duration_minutes": 180,
-            "priority": 2,
-            "features": ["premium_quality", "no_watermark", "downloads", "api_access", "priority_queue"]
-        },
-        "enterprise": {
-            "monthly_price": 499.99,
-            "included_credits": 3000,
-            "price_per_minute": 2.00,
-            "max_duration_minutes": -1,  # Unlimited
-            "priority": 3,
-            "features": ["premium_quality", "no_watermark", "downloads", "api_access", 
-                        "priority_queue", "dedicated_gpu", "sla", "custom_models"]
-        }
+        TierName.FREE: Tier(
+            monthly_price=0,
+            included_credits=10,
+            price_per_minute=5.00,  # Higher price for free tier
+            max_duration_minutes=10,
+            priority=0,
+            features=("basic_quality", "watermark")
+        ),
+        TierName.STARTER: Tier(
+            monthly_price=29.99,
+            included_credits=100,
+            price_per_minute=3.00,
+            max_duration_minutes=60,
+            priority=1,
+            features=("standard_quality", "no_watermark", "downloads")
+        ),
+        TierName.PRO: Tier(
+            monthly_price=99.99,
+            included_credits=500,
+            price_per_minute=2.50,
+            max_duration_minutes=180,
+            priority=2,
+            features=("premium_quality", "no_watermark", "downloads", "api_access", "priority_queue")
+        ),
+        TierName.ENTERPRISE: Tier(
+            monthly_price=499.99,
+            included_credits=3000,
+            price_per_minute=2.00,
+            max_duration_minutes=-1,  # Unlimited
+            priority=3,
+            features=("premium_quality", "no_watermark", "downloads", "api_access",
+                      "priority_queue", "dedicated_gpu", "sla", "custom_models")
+        )
     }
-    
+
     # Credit packages
     CREDIT_PACKAGES = {
-        "small": {"credits": 50, "price": 19.99, "bonus": 0},
-        "medium": {"credits": 150, "price": 49.99, "bonus": 10},  # 10 bonus credits
-        "large": {"credits": 500, "price": 149.99, "bonus": 50},   # 50 bonus credits
-        "mega": {"credits": 2000, "price": 499.99, "bonus": 300},  # 300 bonus credits
+        PackageName.SMALL: CreditPackage(credits=50, price=19.99, bonus=0),
+        PackageName.MEDIUM: CreditPackage(credits=150, price=49.99, bonus=10),
+        PackageName.LARGE: CreditPackage(credits=500, price=149.99, bonus=50),
+        PackageName.MEGA: CreditPackage(credits=2000, price=499.99, bonus=300),
     }
 
 
 class AuthenticationService:
     """Handle user authentication and authorization"""
-    
+
+    # Cap cache TTL so revoked-but-unexpired tokens age out promptly
+    TOKEN_CACHE_MAX_TTL = 3600
+
     def __init__(self):
         self.security = HTTPBearer()
-        
+        self._redis = None
+
+    def _get_redis(self):
+        """Lazily connect to Redis for the token-validation cache"""
+        if self._redis is None:
+            self._redis = aioredis.from_url(
+                os.getenv("REDIS_URL", "redis://localhost:6379"),
+                decode_responses=True
+            )
+        return self._redis
+
+    @staticmethod
+    def _token_cache_key(token: str) -> str:
+        # Hash the token so the raw credential never lands in Redis;
+        # blake3's SIMD path beats SHA-2 on short inputs when installed
+        if blake3 is not None:
+            digest = blake3(token.encode()).hexdigest(length=16)
+        else:
+            digest = hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+        return f"jwt:{digest}"
+
+    # scrypt cost parameters: memory-hard (16MB) so the work factor
+    # holds up without 100k serial hash iterations, and OpenSSL's
+    # SHA-NI-accelerated primitive does the inner compression
+    SCRYPT_N = 2 ** 14
+    SCRYPT_R = 8
+    SCRYPT_P = 1
+
     def hash_password(self, password: str) -> str:
         """Hash password with salt"""
         salt = secrets.token_hex(16)
-        pwd_hash = hashlib.pbkdf2_hmac('sha256', 
-                                       password.encode('utf-8'),
-                                       salt.encode('utf-8'),
-                                       100000)
-        return f"{salt}${pwd_hash.hex()}"
-        
+        pwd_hash = hashlib.scrypt(password.encode('utf-8'),
+                                  salt=salt.encode('utf-8'),
+                                  n=self.SCRYPT_N, r=self.SCRYPT_R,
+                                  p=self.SCRYPT_P, dklen=32)
+        return (f"scrypt${self.SCRYPT_N}${self.SCRYPT_R}${self.SCRYPT_P}"
+                f"${salt}${pwd_hash.hex()}")
+
     def verify_password(self, password: str, password_hash: str) -> bool:
-        """Verify password against hash"""
+        """Verify password against hash
+
+        Dispatches on format prefix so pre-migration PBKDF2 hashes
+        (plain "salt$hash") keep verifying.
+        """
+        if password_hash.startswith('scrypt$'):
+            _, n, r, p, salt, pwd_hash = password_hash.split('$')
+            test_hash = hashlib.scrypt(password.encode('utf-8'),
+                                       salt=salt.encode('utf-8'),
+                                       n=int(n), r=int(r), p=int(p),
+                                       dklen=32)
+            # Compare raw digests - skips building a hex string per login
+            return hmac.compare_digest(test_hash, bytes.fromhex(pwd_hash))
+
+        # Legacy PBKDF2-HMAC-SHA256 format
         salt, pwd_hash = password_hash.split('$')
         test_hash = hashlib.pbkdf2_hmac('sha256',
                                         password.encode('utf-8'),
                                         salt.encode('utf-8'),
                                         100000)
-        return test_hash.hex() == pwd_hash
+        return hmac.compare_digest(test_hash, bytes.fromhex(pwd_hash))
         
+    # The HS256 header never changes, so its base64url form is computed
+    # once instead of being JSON+base64 encoded on every token issued
+    _JWT_HEADER_B64 = base64.urlsafe_b64encode(
+        b'{"alg":"HS256","typ":"JWT"}'
+    ).rstrip(b'=')
+
     def create_access_token(self, user_id: str) -> str:
-        """Create JWT access token"""
+        """Create JWT access token
+
+        Signs directly (cached header + payload JSON + one HMAC) rather
+        than going through jwt.encode, which rebuilds the constant
+        header per call. Output stays a standard HS256 token that
+        jwt.decode verifies.
+        """
+        # time.time() is epoch UTC; naive-datetime .timestamp() would
+        # reinterpret the value in the server's local timezone
         payload = {
             "user_id": user_id,
-            "exp": datetime.utcnow() + timedelta(hours=PlatformConfig.JWT_EXPIRATION_HOURS)
+            "exp": int(time.time()) + PlatformConfig.JWT_EXPIRATION_HOURS * 3600
         }
-        return jwt.encode(payload, PlatformConfig.JWT_SECRET, algorithm=PlatformConfig.JWT_ALGORITHM)
+        payload_b64 = base64.urlsafe_b64encode(
+            _json_dumps_bytes(payload)
+        ).rstrip(b'=')
+        signing_input = self._JWT_HEADER_B64 + b'.' + payload_b64
+        signature = hmac.new(PlatformConfig.JWT_SECRET.encode(),
+                             signing_input, hashlib.sha256).digest()
+        return (signing_input + b'.'
+                + base64.urlsafe_b64encode(signature).rstrip(b'=')).decode()
         
-    def verify_token(self, token: str) -> Dict:
-        """Verify and decode JWT token"""
+    async def verify_token(self, token: str) -> Dict:
+        """Verify and decode JWT token
+
+        Validated claims are cached in Redis keyed by a token hash -
+        the HMAC + base64 + JSON work only runs on first sight of a
+        token instead of on every authenticated request. Cache errors
+        fall through to full verification.
+        """
+        cache_key = self._token_cache_key(token)
+
+        try:
+            cached = await self._get_redis().get(cache_key)
+            if cached:
+                return json.loads(cached)
+        except Exception:
+            pass
+
+        # Reject expired tokens on an unverified timestamp compare
+        # before paying for HMAC - expired tokens from abandoned tabs
+        # and bots are the common failure case. exp isn't secret, and
+        # non-expired tokens still get full signature verification.
+        try:
+            claims_segment = token.split('.')[1]
+            claims = json.loads(base64.urlsafe_b64decode(
+                claims_segment + '=' * (-len(claims_segment) % 4)
+            ))
+            if claims['exp'] < time.time():
+                raise HTTPException(status_code=401, detail="Token expired")
+        except HTTPException:
+            raise
+        except Exception:
+            pass  # Malformed - let jwt.decode produce the proper error
+
         try:
-            payload = jwt.decode(token, PlatformConfig.JWT_SECRET, 
+            payload = jwt.decode(token, PlatformConfig.JWT_SECRET,
                                algorithms=[PlatformConfig.JWT_ALGORITHM])
-            return payload
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=401, detail="Token expired")
         except jwt.JWTError:
             raise HTTPException(status_code=401, detail="Invalid token")
 
+        try:
+            ttl = min(self.TOKEN_CACHE_MAX_TTL,
+                      int(payload['exp'] - time.time()))
+            if ttl > 0:
+                await self._get_redis().set(
+                    cache_key, _json_dumps_bytes(payload).decode(), ex=ttl
+                )
+        except Exception:
+            pass
+
+        return payload
+
+    async def revoke_token(self, token: str):
+        """Drop a token's cached claims (logout / password change)"""
+        try:
+            await self._get_redis().delete(self._token_cache_key(token))
+        except Exception:
+            pass
+
+
+# Configure once at import rather than on every CreditManager construction
+stripe.api_key = PlatformConfig.STRIPE_SECRET_KEY
+
+# A shared client keeps the TLS connection to Stripe alive, so each
+# PaymentIntent pays one round-trip instead of a fresh handshake
+stripe.default_http_client = stripe.http_client.RequestsClient()
+
 
 class CreditManager:
     """Manage user credits and billing"""
-    
-    def __init__(self, db_session: Session):
+
+    def __init__(self, db_session: AsyncSession):
         self.db = db_session
-        stripe.api_key = PlatformConfig.STRIPE_SECRET_KEY
-        
+
     async def purchase_credits(self, user_id: str, package: str) -> Dict:
         """Process credit purchase"""
-        
-        if package not in PlatformConfig.CREDIT_PACKAGES:
+
+        package_info = PlatformConfig.CREDIT_PACKAGES.get(package)
+        if package_info is None:
             raise ValueError("Invalid credit package")
-            
-        package_info = PlatformConfig.CREDIT_PACKAGES[package]
-        total_credits = package_info['credits'] + package_info['bonus']
-        
-        # Create Stripe payment intent
-        payment_intent = stripe.PaymentIntent.create(
-            amount=int(package_info['price'] * 100),  # Stripe uses cents
+
+        total_credits = package_info.credits + package_info.bonus
+
+        # Create Stripe payment intent on a worker thread - the sync
+        # client's HTTP round-trip would otherwise block the event loop
+        # and serialize concurrent checkouts
+        payment_intent = await asyncio.to_thread(
+            stripe.PaymentIntent.create,
+            amount=int(package_info.price * 100),  # Stripe uses cents
             currency='usd',
             metadata={
                 'user_id': user_id,
@@ -219,136 +470,216 @@ class CreditManager:
             'payment_intent_id': payment_intent.id,
             'client_secret': payment_intent.client_secret,
             'credits': total_credits,
-            'price': package_info['price']
+            'price': package_info.price
         }
         
-    async def apply_credits(self, user_id: str, credits: float, 
-                           transaction_type: str, description: str) -> float:
-        """Apply credits to user account"""
-        
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
+    async def _apply_credits(self, user_id: str, credits: float,
+                       transaction_type: str, description: str) -> float:
+        """Stage a credit change without committing
+
+        Callers composing several writes (create project + debit +
+        transaction) use the _apply_* forms inside one transaction so
+        the request pays a single commit/fsync instead of one per step.
+        """
+
+        # One atomic UPDATE instead of read-modify-write - no SELECT
+        # round-trip and no lost updates under concurrent grants
+        balance = (await self.db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(credits=User.credits + credits)
+            .returning(User.credits)
+        )).scalar()
+        if balance is None:
             raise ValueError("User not found")
-            
-        user.credits += credits
-        
-        # Record transaction
-        transaction = Transaction(
-            id=secrets.token_hex(16),
+
+        # Record transaction via Core insert - skips unit-of-work
+        # bookkeeping for a row nothing reads back, and takes a values
+        # list unchanged if callers ever batch several ledger entries
+        await self.db.execute(insert(Transaction).values(
             user_id=user_id,
             type=transaction_type,
             credits=credits,
             description=description
-        )
-        self.db.add(transaction)
-        self.db.commit()
-        
-        return user.credits
-        
-    async def use_credits(self, user_id: str, project_id: str, 
-                         duration_minutes: int) -> Dict:
-        """Deduct credits for project generation"""
-        
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise ValueError("User not found")
-            
+        ))
+
+        return balance
+
+    async def _apply_use_credits(self, user: User, project_id: str,
+                           duration_minutes: int) -> Dict:
+        """Stage a usage debit without committing
+
+        Takes the already-loaded User so callers that fetched it for
+        their own checks (create_project) don't trigger a second
+        lookup for the same primary key.
+        """
+
         # Calculate cost based on tier
         tier_info = PlatformConfig.SUBSCRIPTION_TIERS[user.subscription_tier]
-        cost = duration_minutes * tier_info['price_per_minute']
-        
-        if user.credits < cost:
+        cost = duration_minutes * tier_info.price_per_minute
+
+        # Conditional UPDATE makes check-and-debit atomic at the DB:
+        # two concurrent projects can no longer both pass a Python-side
+        # balance check and drive the account negative
+        remaining = (await self.db.execute(
+            update(User)
+            .where(User.id == user.id, User.credits >= cost)
+            .values(credits=User.credits - cost)
+            .returning(User.credits)
+        )).scalar()
+        if remaining is None:
             raise ValueError(f"Insufficient credits. Need {cost}, have {user.credits}")
-            
-        # Deduct credits
-        user.credits -= cost
-        
-        # Record usage
-        transaction = Transaction(
-            id=secrets.token_hex(16),
-            user_id=user_id,
+
+        # Keep the in-session instance consistent with the DB-side
+        # decrement without marking it dirty
+        self.db.expire(user, ['credits'])
+
+        # Record usage via Core insert (see _apply_credits)
+        await self.db.execute(insert(Transaction).values(
+            user_id=user.id,
             type='usage',
             credits=-cost,
             description=f"Project {project_id}: {duration_minutes} minutes"
-        )
-        self.db.add(transaction)
-        self.db.commit()
-        
+        ))
+
         return {
             'credits_used': cost,
-            'remaining_credits': user.credits
+            'remaining_credits': remaining
         }
 
+    async def apply_credits(self, user_id: str, credits: float,
+                           transaction_type: str, description: str) -> float:
+        """Apply credits to user account"""
+
+        balance = await self._apply_credits(user_id, credits, transaction_type, description)
+        await self.db.commit()
+        return balance
+
+    async def use_credits(self, user_id: str, project_id: str,
+                         duration_minutes: int) -> Dict:
+        """Deduct credits for project generation"""
+
+        user = await self.db.get(User, user_id)
+        if not user:
+            raise ValueError("User not found")
+        result = await self._apply_use_credits(user, project_id, duration_minutes)
+        await self.db.commit()
+        return result
+
+
+# Keeps fire-and-forget tasks alive until done (the loop only holds
+# weak references to tasks)
+_BACKGROUND_TASKS: set = set()
+
 
 class GPUOrchestrator:
     """Manage GPU nodes and job distribution"""
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: AsyncSession):
         self.db = db_session
-        self.providers = {
-            'runpod': RunPodProvider(),
-            'vast': VastAIProvider(),
-            'lambda': LambdaLabsProvider()
-        }
+        self.providers = PROVIDERS
         
     async def scale_up(self, required_capacity: int) -> List[str]:
         """Scale up GPU capacity based on demand"""
         
-        current_nodes = self.db.query(GPUNode).filter(
-            GPUNode.status == 'available'
-        ).count()
+        current_nodes = await self.db.scalar(
+            select(func.count()).select_from(GPUNode).where(
+                GPUNode.status == 'available'
+            )
+        )
         
         if current_nodes >= required_capacity:
             return []
             
         nodes_to_add = required_capacity - current_nodes
-        new_nodes = []
-        
-        # Prioritize cheapest providers
-        for provider_name in ['vast', 'runpod', 'lambda']:
-            if nodes_to_add <= 0:
-                break
-                
-            provider = self.providers[provider_name]
-            launched = await provider.launch_instances(
+        rows = []
+
+        # Cheapest first - budget is consumed in this order below
+        provider_order = ['vast', 'runpod', 'lambda']
+
+        # Launch across all providers concurrently; each request is a
+        # slow network round-trip, so sequential fan-out made scale_up
+        # latency the sum of all provider latencies
+        results = await asyncio.gather(
+            *(self.providers[name].launch_instances(
                 count=min(nodes_to_add, 5),  # Max 5 per provider at once
                 gpu_type='rtx4090'  # Start with cheapest
-            )
-            
+            ) for name in provider_order),
+            return_exceptions=True
+        )
+
+        surplus = []
+        for provider_name, launched in zip(provider_order, results):
+            if isinstance(launched, Exception):
+                continue  # One provider failing shouldn't sink the rest
+
             for instance in launched:
-                node = GPUNode(
-                    id=secrets.token_hex(8),
-                    provider=provider_name,
-                    instance_id=instance['instance_id'],
-                    gpu_type=instance['gpu_type'],
-                    hourly_cost=instance['hourly_cost'],
-                    status='available',
-                    region=instance['region']
-                )
-                self.db.add(node)
-                new_nodes.append(node.id)
+                if nodes_to_add <= 0:
+                    surplus.append((provider_name, instance))
+                    continue
+                rows.append({
+                    'id': uuid.uuid4().hex,
+                    'provider': provider_name,
+                    'instance_id': instance['instance_id'],
+                    'gpu_type': instance['gpu_type'],
+                    'hourly_cost': instance['hourly_cost'],
+                    'status': 'available',
+                    'region': instance['region']
+                })
                 nodes_to_add -= 1
-                
-        self.db.commit()
-        return new_nodes
+
+        # Concurrent launches can over-provision; release the surplus
+        # so it doesn't bill idle. Teardown doesn't affect the returned
+        # nodes, so it runs fire-and-forget instead of adding a provider
+        # round-trip to the caller's latency.
+        if surplus:
+            task = asyncio.create_task(asyncio.gather(
+                *(self.providers[name].terminate_instance(inst['instance_id'])
+                  for name, inst in surplus),
+                return_exceptions=True
+            ))
+            # Strong reference so the event loop can't GC the task
+            # before the terminates finish
+            _BACKGROUND_TASKS.add(task)
+            task.add_done_callback(_BACKGROUND_TASKS.discard)
+
+        if not rows:
+            return []
+
+        # One multi-row INSERT instead of per-node unit-of-work flushes
+        await self.db.execute(insert(GPUNode), rows)
+        await self.db.commit()
+        GPUOrchestrator._status_cache = None  # fleet changed
+        return [row['id'] for row in rows]
         
     async def scale_down(self, excess_capacity: int) -> List[str]:
         """Scale down GPU capacity to save costs"""
         
         # Find idle nodes (prioritize most expensive to terminate)
-        idle_nodes = self.db.query(GPUNode).filter(
-            GPUNode.status == 'available',
-            GPUNode.current_project_id == None
-        ).order_by(GPUNode.hourly_cost.desc()).limit(excess_capacity).all()
+        result = await self.db.execute(
+            select(GPUNode).where(
+                GPUNode.status == 'available',
+                GPUNode.current_project_id == None
+            ).order_by(GPUNode.hourly_cost.desc()).limit(excess_capacity)
+        )
+        idle_nodes = result.scalars().all()
         
+        # Terminate concurrently - one round-trip of latency for the
+        # whole batch instead of one per node
+        results = await asyncio.gather(
+            *(self.providers[node.provider].terminate_instance(node.instance_id)
+              for node in idle_nodes),
+            return_exceptions=True
+        )
+
         terminated = []
-        for node in idle_nodes:
-            provider = self.providers[node.provider]
-            if await provider.terminate_instance(node.instance_id):
+        for node, result in zip(idle_nodes, results):
+            if result is True:
                 node.status = 'terminated'
                 terminated.append(node.id)
-                
-        self.db.commit()
+
+        await self.db.commit()
+        GPUOrchestrator._status_cache = None  # fleet changed
         return terminated
         
     async def assign_project_to_node(self, project_id: str, 
@@ -364,13 +695,19 @@ class GPUOrchestrator:
             gpu_types = ['a100_80gb', 'h100']
             
         # Find best available node
-        node = self.db.query(GPUNode).filter(
-            GPUNode.status == 'available',
-            GPUNode.gpu_type.in_(gpu_types)
-        ).order_by(
-            GPUNode.performance_score.desc(),
-            GPUNode.hourly_cost.asc()
-        ).first()
+        # SKIP LOCKED hands each concurrent assigner a distinct row, so
+        # parallel project creations stop racing for the same top node
+        # (SQLite has no row locks and ignores the clause)
+        result = await self.db.execute(
+            select(GPUNode).where(
+                GPUNode.status == 'available',
+                GPUNode.gpu_type.in_(gpu_types)
+            ).order_by(
+                GPUNode.performance_score.desc(),
+                GPUNode.hourly_cost.asc()
+            ).with_for_update(skip_locked=True).limit(1)
+        )
+        node = result.scalars().first()
         
         if not node:
             # Try to scale up
@@ -380,26 +717,44 @@ class GPUOrchestrator:
         # Assign project
         node.status = 'busy'
         node.current_project_id = project_id
-        self.db.commit()
-        
+        await self.db.commit()
+
         return node.id
         
-    async def get_cluster_status(self) -> Dict:
+    # Dashboard pollers can hit cluster status several times a second;
+    # a short TTL collapses that into one GROUP BY query per window.
+    # Class-level so every per-request orchestrator shares it.
+    _STATUS_TTL = 3.0
+    _status_cache: Optional[tuple] = None
+
+    async def get_cluster_status(self, use_cache: bool = True) -> Dict:
         """Get current cluster status and metrics"""
+
+        cache = GPUOrchestrator._status_cache
+        if (use_cache and cache is not None
+                and time.monotonic() - cache[0] < self._STATUS_TTL):
+            return cache[1]
+
+        # One GROUP BY round-trip instead of three counts plus a
+        # materialize-and-sum of every node's hourly_cost in Python
+        result = await self.db.execute(
+            select(
+                GPUNode.status,
+                func.count(),
+                func.coalesce(func.sum(GPUNode.hourly_cost), 0.0)
+            ).group_by(GPUNode.status)
+        )
+        by_status = {status: (count, cost) for status, count, cost in result}
+
+        total_nodes = sum(count for count, _ in by_status.values())
+        available = by_status.get('available', (0, 0.0))[0]
+        busy = by_status.get('busy', (0, 0.0))[0]
+        total_hourly_cost = sum(
+            cost for status, (_, cost) in by_status.items()
+            if status in ('available', 'busy')
+        )
         
-        total_nodes = self.db.query(GPUNode).count()
-        available = self.db.query(GPUNode).filter(GPUNode.status == 'available').count()
-        busy = self.db.query(GPUNode).filter(GPUNode.status == 'busy').count()
-        
-        hourly_cost = self.db.query(GPUNode).filter(
-            GPUNode.status.in_(['available', 'busy'])
-        ).with_entities(
-            GPUNode.hourly_cost
-        ).all()
-        
-        total_hourly_cost = sum(cost[0] for cost in hourly_cost)
-        
-        return {
+        status = {
             'total_nodes': total_nodes,
             'available_nodes': available,
             'busy_nodes': busy,
@@ -408,30 +763,148 @@ class GPUOrchestrator:
             'daily_cost': total_hourly_cost * 24,
             'monthly_cost': total_hourly_cost * 24 * 30
         }
+        GPUOrchestrator._status_cache = (time.monotonic(), status)
+        return status
 
 
 # Provider implementations (simplified)
 class RunPodProvider:
     """RunPod GPU provider interface"""
-    
+
+    API_BASE = "https://rest.runpod.io/v1"
+
+    GPU_IDS = {
+        'rtx4090': 'NVIDIA GeForce RTX 4090',
+        'a100_40gb': 'NVIDIA A100-PCIE-40GB',
+        'a100_80gb': 'NVIDIA A100 80GB PCIe',
+        'h100': 'NVIDIA H100 80GB HBM3',
+    }
+
+    # Provider errors worth retrying (rate limits and server blips)
+    TRANSIENT_STATUSES = (429, 500, 502, 503, 504)
+
+    # Static part of the pod-create body, built once and read-only so
+    # concurrent launches can't race on a shared mutable dict
+    POD_TEMPLATE = MappingProxyType({
+        "imageName": "runpod/pytorch:2.1.0-py3.10-cuda11.8.0",
+        "gpuCount": 1,
+    })
+
+    def __init__(self):
+        self.api_key = os.getenv("RUNPOD_API_KEY")
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the shared HTTP session"""
+        # Async so concurrent pod starts overlap on one connection pool
+        # instead of serializing the event loop on blocking requests
+        if self._session is None or self._session.closed:
+            # Bounded pool with keep-alive: concurrent launches reuse
+            # warm connections to the API host instead of paying a TLS
+            # handshake each, and the limits cap socket growth under a
+            # scale-up storm
+            self._session = aiohttp.ClientSession(
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    keepalive_timeout=30.0
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+
+    async def close(self):
+        """Release the shared HTTP session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def _request_json(self, method: str, url: str,
+                            attempts: int = 3, **kwargs) -> Dict:
+        """Issue an API request with bounded, jittered-backoff retries"""
+
+        session = await self._get_session()
+        delay = 1.0
+
+        for attempt in range(attempts):
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if (response.status in self.TRANSIENT_STATUSES
+                            and attempt < attempts - 1):
+                        # Rate-limit storm or provider blip - back off with
+                        # jitter so parallel pod starts don't retry in sync
+                        await asyncio.sleep(delay + random.random())
+                        delay *= 2
+                        continue
+
+                    response.raise_for_status()
+                    if response.status == 204:
+                        return {}
+                    return await response.json()
+
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(delay + random.random())
+                delay *= 2
+
     async def launch_instances(self, count: int, gpu_type: str) -> List[Dict]:
         """Launch RunPod instances"""
-        # This would use RunPod API
-        # Simplified for example
-        instances = []
-        for i in range(count):
-            instances.append({
-                'instance_id': f"runpod_{secrets.token_hex(8)}",
-                'gpu_type': gpu_type,
-                'hourly_cost': 0.44 if gpu_type == 'rtx4090' else 1.19,
-                'region': 'us-east-1'
-            })
-        return instances
-        
+
+        if not self.api_key:
+            # No credentials configured - simulated instances for dev
+            instances = []
+            for i in range(count):
+                instances.append({
+                    'instance_id': f"runpod_{secrets.token_hex(8)}",
+                    'gpu_type': gpu_type,
+                    'hourly_cost': 0.44 if gpu_type == 'rtx4090' else 1.19,
+                    'region': 'us-east-1'
+                })
+            return instances
+
+        # All pod creates go out together over the shared keep-alive
+        # session; sequential awaits made launch time count * RTT.
+        # return_exceptions so one failed create doesn't discard the
+        # pods that did come up - those would keep billing with no
+        # GPUNode row and no terminate call.
+        results = await asyncio.gather(*(
+            self._request_json("POST", f"{self.API_BASE}/pods", json={
+                **self.POD_TEMPLATE,
+                "name": f"sysrai-{gpu_type}",
+                "gpuTypeId": self.GPU_IDS[gpu_type],
+            }) for _ in range(count)
+        ), return_exceptions=True)
+
+        pods = [pod for pod in results
+                if not isinstance(pod, BaseException)]
+        failed = len(results) - len(pods)
+        if failed:
+            if not pods:
+                # Nothing came up - surface the first error to the caller
+                raise next(r for r in results
+                           if isinstance(r, BaseException))
+            logger.warning("%d of %d RunPod creates failed; keeping the "
+                           "%d that launched", failed, count, len(pods))
+
+        return [{
+            'instance_id': pod['id'],
+            'gpu_type': gpu_type,
+            'hourly_cost': pod.get('costPerHr', 0.44),
+            'region': pod.get('machine', {}).get('dataCenterId', 'us-east-1')
+        } for pod in pods]
+
     async def terminate_instance(self, instance_id: str) -> bool:
         """Terminate RunPod instance"""
-        # Would call RunPod API
-        return True
+
+        if not self.api_key:
+            return True
+
+        try:
+            await self._request_json("DELETE", f"{self.API_BASE}/pods/{instance_id}")
+            return True
+        except aiohttp.ClientError:
+            return False
 
 class VastAIProvider:
     """Vast.ai GPU provider interface"""
@@ -470,16 +943,41 @@ class LambdaLabsProvider:
         return True
 
 
+# Providers hold no per-request state (just API keys and a shared HTTP
+# session), so one instance each serves every request instead of three
+# fresh allocations per GPUOrchestrator construction
+PROVIDERS = {
+    'runpod': RunPodProvider(),
+    'vast': VastAIProvider(),
+    'lambda': LambdaLabsProvider()
+}
+
+
 # FastAPI application
-app = FastAPI(title="SkyReels Film Platform API")
+# orjson encodes every endpoint response (cluster status dicts,
+# project listings) several times faster than stdlib json
+app = FastAPI(
+    title="SkyReels Film Platform API",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
+)
+
+# Explicit origin allowlist: a compiled regex lets the middleware
+# short-circuit origin checks, and enumerating methods/headers makes
+# the preflight response a precomputed constant. A "*" wildcard with
+# credentials would force the slow per-request rewrite path (and is
+# invalid per the CORS spec anyway).
+app.add_middleware(
+    CORSMiddleware,
+    allow_origin_regex=r"^https://([a-z0-9-]+\.)?sysrai\.com$",
+    allow_credentials=True,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+)
 
 # Dependency injection
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 auth_service = AuthenticationService()
 
@@ -488,7 +986,11 @@ class UserRegistration(BaseModel):
     email: EmailStr
     password: str
     referral_code: Optional[str] = None
-    
+
+class UserLogin(BaseModel):
+    email: EmailStr
+    password: str
+
 class ProjectRequest(BaseModel):
     title: str
     duration_minutes: int
@@ -500,34 +1002,51 @@ class ProjectRequest(BaseModel):
 
 # API Endpoints
 @app.post("/api/register")
-async def register(registration: UserRegistration, db: Session = Depends(get_db)):
+async def register(registration: UserRegistration, db: AsyncSession = Depends(get_db)):
     """Register new user"""
     
     # Check if email exists
-    existing = db.query(User).filter(User.email == registration.email).first()
+    existing = await db.scalar(
+        select(User).where(User.email == registration.email)
+    )
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
         
     # Create user
+    # Key derivation holds the GIL for tens of ms; run it on a worker
+    # thread so concurrent requests don't serialize behind it
+    password_hash = await asyncio.to_thread(
+        auth_service.hash_password, registration.password
+    )
+
+    # One CSPRNG read covers both tokens
+    referral_code, api_key = _hex_tokens(8, 32)
+
     user = User(
-        id=secrets.token_hex(16),
         email=registration.email,
-        password_hash=auth_service.hash_password(registration.password),
-        referral_code=secrets.token_hex(8),
+        password_hash=password_hash,
+        referral_code=referral_code,
         referred_by=registration.referral_code,
-        api_key=secrets.token_hex(32)
+        api_key=api_key
     )
     
-    # Give bonus credits for referral
+    db.add(user)
+
+    # Give bonus credits for referral - one UPDATE ... RETURNING both
+    # validates the code and applies the bonus atomically, instead of a
+    # SELECT plus a read-modify-write racing with other signups
     if registration.referral_code:
-        referrer = db.query(User).filter(User.referral_code == registration.referral_code).first()
-        if referrer:
-            referrer.credits += 25  # Bonus credits for referral
+        referrer_id = (await db.execute(
+            update(User)
+            .where(User.referral_code == registration.referral_code)
+            .values(credits=User.credits + 25)  # Bonus credits for referral
+            .returning(User.id)
+        )).scalar()
+        if referrer_id is not None:
             user.credits = 10  # Bonus for being referred
-            
-    db.add(user)
-    db.commit()
-    
+
+    await db.commit()
+
     token = auth_service.create_access_token(user.id)
     
     return {
@@ -538,34 +1057,65 @@ async def register(registration: UserRegistration, db: Session = Depends(get_db)
         "credits": user.credits
     }
 
+@app.post("/api/login")
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
+    """Authenticate user and issue access token"""
+
+    user = await db.scalar(
+        select(User).where(User.email == credentials.email)
+    )
+
+    # Verify off the event loop - a burst of logins would otherwise
+    # serialize the whole process on the key-derivation loop
+    if not user or not await asyncio.to_thread(
+        auth_service.verify_password, credentials.password, user.password_hash
+    ):
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+
+    # Upgrade legacy PBKDF2 hashes to scrypt on successful login
+    if not user.password_hash.startswith('scrypt$'):
+        user.password_hash = await asyncio.to_thread(
+            auth_service.hash_password, credentials.password
+        )
+
+    user.last_login = datetime.utcnow()
+    await db.commit()
+
+    token = auth_service.create_access_token(user.id)
+
+    return {
+        "user_id": user.id,
+        "token": token,
+        "credits": user.credits
+    }
+
 @app.post("/api/projects")
 async def create_project(
     project: ProjectRequest,
     authorization: HTTPAuthorizationCredentials = Depends(auth_service.security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create new film project"""
     
     # Verify token
-    payload = auth_service.verify_token(authorization.credentials)
+    payload = await auth_service.verify_token(authorization.credentials)
     user_id = payload['user_id']
     
     # Check credits
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     tier_info = PlatformConfig.SUBSCRIPTION_TIERS[user.subscription_tier]
     
     # Check duration limit
-    if tier_info['max_duration_minutes'] > 0 and project.duration_minutes > tier_info['max_duration_minutes']:
+    if tier_info.max_duration_minutes > 0 and project.duration_minutes > tier_info.max_duration_minutes:
         raise HTTPException(status_code=403, 
-                          detail=f"Duration exceeds tier limit of {tier_info['max_duration_minutes']} minutes")
+                          detail=f"Duration exceeds tier limit of {tier_info.max_duration_minutes} minutes")
     
     # Calculate cost
-    from skyreels_film_platform import PricingEngine
-    costs = PricingEngine.calculate_project_cost(
-        duration_minutes=project.duration_minutes,
-        include_script=project.include_script,
-        include_storyboard=project.include_storyboard,
-        quality=project.quality
+    costs = _project_cost(
+        project.duration_minutes,
+        project.include_script,
+        project.include_storyboard,
+        project.quality
     )
     
     if user.credits < costs['total']:
@@ -574,30 +1124,31 @@ async def create_project(
     
     # Create project
     project_obj = Project(
-        id=secrets.token_hex(16),
         user_id=user_id,
         title=project.title,
         duration_minutes=project.duration_minutes,
         format=project.format,
         status='queued',
         cost=costs['total'],
-        metadata=json.dumps(project.dict())
+        extra_metadata=_json_dumps_bytes(project.dict()).decode()
     )
     
     db.add(project_obj)
-    
-    # Deduct credits
+
+    # Deduct credits - staged only, so project + debit + transaction
+    # land in a single commit below
     credit_manager = CreditManager(db)
-    await credit_manager.use_credits(user_id, project_obj.id, project.duration_minutes)
-    
+    await db.flush()  # assign the project's uuid default before the debit references it
+    await credit_manager._apply_use_credits(user, project_obj.id, project.duration_minutes)
+
     # Assign to GPU node
     orchestrator = GPUOrchestrator(db)
     node_id = await orchestrator.assign_project_to_node(
-        project_obj.id, 
+        project_obj.id,
         project.duration_minutes
     )
-    
-    db.commit()
+
+    await db.commit()
     
     return {
         "project_id": project_obj.id,
@@ -608,8 +1159,47 @@ async def create_project(
         "assigned_node": node_id
     }
 
+@app.get("/api/projects")
+async def get_user_projects(
+    after_id: Optional[str] = None,
+    # Clamped so ?limit=10000000 can't materialize a whole history in
+    # one response and defeat the keyset pagination
+    limit: int = Query(100, ge=1, le=500),
+    authorization: HTTPAuthorizationCredentials = Depends(auth_service.security),
+    db: AsyncSession = Depends(get_db)
+):
+    """List the caller's projects with keyset pagination
+
+    Keyset (id < after_id) keeps page-N latency constant where OFFSET
+    pagination would rescan everything skipped.
+    """
+
+    payload = await auth_service.verify_token(authorization.credentials)
+
+    stmt = select(Project).where(Project.user_id == payload['user_id'])
+    if after_id:
+        stmt = stmt.where(Project.id < after_id)
+    result = await db.execute(stmt.order_by(Project.id.desc()).limit(limit))
+    projects = result.scalars().all()
+
+    return {
+        "projects": [
+            {
+                "project_id": p.id,
+                "title": p.title,
+                "status": p.status,
+                "format": p.format,
+                "duration_minutes": p.duration_minutes,
+                "created_at": p.created_at.isoformat() if p.created_at else None
+            }
+            for p in projects
+        ],
+        # Pass back as after_id to fetch the next page
+        "last_id": projects[-1].id if projects else None
+    }
+
 @app.get("/api/cluster/status")
-async def get_cluster_status(db: Session = Depends(get_db)):
+async def get_cluster_status(db: AsyncSession = Depends(get_db)):
     """Get GPU cluster status"""
     orchestrator = GPUOrchestrator(db)
     return await orchestrator.get_cluster_status()
@@ -619,15 +1209,15 @@ async def scale_cluster(
     action: str,
     count: int,
     authorization: HTTPAuthorizationCredentials = Depends(auth_service.security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Manually scale cluster (admin only)"""
     
     # Verify admin token
-    payload = auth_service.verify_token(authorization.credentials)
-    user = db.query(User).filter(User.id == payload['user_id']).first()
+    payload = await auth_service.verify_token(authorization.credentials)
+    user = await db.get(User, payload['user_id'])
     
-    if user.subscription_tier != 'enterprise':  # Only enterprise can scale
+    if user.subscription_tier != TierName.ENTERPRISE:  # Only enterprise can scale
         raise HTTPException(status_code=403, detail="Admin access required")
     
     orchestrator = GPUOrchestrator(db)
@@ -643,9 +1233,69 @@ async def scale_cluster(
 
 
 # Database initialization
-engine = create_engine(os.getenv("DATABASE_URL", "sqlite:///skyreels_platform.db"))
-Base.metadata.create_all(bind=engine)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///skyreels_platform.db")
+
+if DATABASE_URL.startswith("sqlite"):
+    if not DATABASE_URL.startswith("sqlite+"):
+        DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    engine = create_async_engine(DATABASE_URL, pool_size=5)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        # WAL lets readers run alongside the writer, and
+        # synchronous=NORMAL halves fsyncs per commit - SQLite's
+        # defaults (DELETE journal + FULL sync) are the slowest combo
+        cursor = dbapi_conn.cursor()
+        for pragma in ("journal_mode=WAL",
+                       "synchronous=NORMAL",
+                       "temp_store=MEMORY",
+                       "mmap_size=268435456",
+                       "cache_size=-65536",
+                       "foreign_keys=ON"):
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+else:
+    if DATABASE_URL.startswith("postgresql://"):
+        # psycopg3 replaces psycopg2: async-capable under
+        # create_async_engine, with server-side prepared statements
+        # cached automatically for hot queries
+        DATABASE_URL = DATABASE_URL.replace(
+            "postgresql://", "postgresql+psycopg://", 1
+        )
+    engine = create_async_engine(
+        DATABASE_URL,
+        pool_size=20,
+        max_overflow=40,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        pool_recycle=3600
+    )
+
+# expire_on_commit=False keeps committed objects readable without a
+# lazy refresh round-trip after every commit
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+
+@app.on_event("startup")
+async def init_db():
+    # create_all probes the catalog for every table; with several
+    # uvicorn workers that thunders the DB on each scale-out. Prod
+    # deployments that manage the schema out of band set
+    # SYSRAI_AUTO_CREATE_TABLES=0 to skip it (default stays on so the
+    # zero-config SQLite dev path keeps working).
+    if os.getenv("SYSRAI_AUTO_CREATE_TABLES", "1") == "1":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+
+@app.on_event("shutdown")
+async def close_provider_sessions():
+    # The provider singletons hold keep-alive HTTP sessions for the
+    # process lifetime; release them cleanly on shutdown
+    for provider in PROVIDERS.values():
+        close = getattr(provider, 'close', None)
+        if close is not None:
+            await close()
 
 if __name__ == "__main__":
     import uvicorn
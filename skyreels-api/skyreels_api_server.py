@@ -5,20 +5,62 @@ Simple FastAPI wrapper around SkyReels V2 for video generation
 """
 
 import os
+import sys
 import json
 import uuid
 import asyncio
+import logging
+import logging.handlers
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 import torch
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import NoCredentialsError
 
-app = FastAPI(title="SkyReels API Service", version="1.0.0")
+try:
+    # libuv-backed loop: fewer Python frames per I/O callback, so
+    # request dispatch and background-task scheduling spend less time
+    # in the interpreter (uvicorn's "auto" loop picks it up once
+    # installed)
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
+try:
+    # C JSON serializer - used for the shutdown state dump, which can
+    # carry a large queue snapshot
+    import orjson
+except ImportError:
+    orjson = None
+
+# Buffered logging instead of print(): under Docker/Gunicorn stdout is
+# unbuffered and each print blocks on a synchronous pipe write while
+# holding the GIL. The MemoryHandler batches INFO records and flushes
+# on ERROR (or when the buffer fills), keeping log writes off the job
+# hot path.
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+)
+logger = logging.getLogger("sysrai.skyreels")
+logger.addHandler(logging.handlers.MemoryHandler(
+    capacity=1024, target=_stream_handler
+))
+logger.setLevel(logging.INFO)
+
+# orjson serializes status/queue responses in C instead of stdlib json
+app = FastAPI(
+    title="SkyReels API Service",
+    version="1.0.0",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
+)
 
 # Global variables
 SKYREELS_MODEL = None
@@ -55,29 +97,59 @@ class HealthResponse(BaseModel):
     queue_size: int
     uptime_seconds: int
 
-# Job queue for managing video generation
-video_queue = []
+# Stream uploads in 8MB multipart chunks with a few parallel parts -
+# peak memory stays O(part_size) per transfer regardless of film size
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4
+)
+
+S3_BUCKET_NAME = os.getenv('S3_BUCKET_NAME', 'sysrai-videos')
+
+
+@lru_cache(maxsize=1)
+def get_s3_client():
+    """Shared S3 client - construction parses the endpoint/credential
+    config and builds the connection pool, so do it once instead of per
+    upload (boto3 clients are thread-safe)"""
+    return boto3.client('s3')
+
+# Job queue for managing video generation. A single long-lived worker
+# task drains job_queue so request handlers only enqueue - generation
+# no longer runs piggybacked on the response cycle via BackgroundTasks,
+# where a burst of requests would spawn one competing task per request.
+job_queue: asyncio.Queue = asyncio.Queue()
+queued_jobs = {}
 processing_jobs = {}
 completed_jobs = {}
 
+# Strong reference to the worker task - the event loop only holds weak
+# references, so an unreferenced consumer could be garbage-collected
+# mid-run and silently stall the queue
+_worker_task = None
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize SkyReels model on startup"""
-    global SKYREELS_MODEL
-    
-    print("Starting SkyReels API Service...")
-    print(f"GPU Available: {torch.cuda.is_available()}")
+    global SKYREELS_MODEL, _worker_task
+
+    # Dedicated consumer for the generation queue
+    _worker_task = asyncio.create_task(video_worker())
+
+    logger.info("Starting SkyReels API Service...")
+    logger.info("GPU Available: %s", torch.cuda.is_available())
     
     if torch.cuda.is_available():
-        print(f"GPU: {torch.cuda.get_device_name(0)}")
-        print(f"VRAM: {torch.cuda.get_device_properties(0).total_memory / 1e9:.1f} GB")
+        logger.info("GPU: %s", torch.cuda.get_device_name(0))
+        logger.info("VRAM: %.1f GB", torch.cuda.get_device_properties(0).total_memory / 1e9)
     
     # Initialize SkyReels model
     try:
         await load_skyreels_model()
-        print("SkyReels model loaded successfully")
+        logger.info("SkyReels model loaded successfully")
     except Exception as e:
-        print(f"Error loading SkyReels model: {e}")
+        logger.error("Error loading SkyReels model: %s", e)
         # Don't fail startup - handle gracefully
 
 async def load_skyreels_model():
@@ -86,16 +158,16 @@ async def load_skyreels_model():
     
     # Check if models exist
     if not MODEL_DIR.exists() or not any(MODEL_DIR.iterdir()):
-        print("Downloading SkyReels V2 models...")
+        logger.info("Downloading SkyReels V2 models...")
         await download_skyreels_models()
     
     # Load the model (placeholder - replace with actual SkyReels loading)
     # SKYREELS_MODEL = load_skyreels_v2_model(MODEL_DIR)
-    print("SkyReels model loading simulated (replace with actual implementation)")
+    logger.info("SkyReels model loading simulated (replace with actual implementation)")
 
 async def download_skyreels_models():
     """Download SkyReels V2 models from Hugging Face"""
-    print("Downloading SkyReels V2 models (this may take 15-20 minutes)...")
+    logger.info("Downloading SkyReels V2 models (this may take 15-20 minutes)...")
     
     # Simulate download (replace with actual Hugging Face download)
     from huggingface_hub import snapshot_download
@@ -113,16 +185,16 @@ async def download_skyreels_models():
         else:
             model_repo = "SkyworkAI/SkyReels-V2-1.3B-540P"
         
-        print(f"Downloading {model_repo}...")
+        logger.info("Downloading %s...", model_repo)
         snapshot_download(
             repo_id=model_repo,
             local_dir=str(MODEL_DIR),
             resume_download=True
         )
-        print("Models downloaded successfully")
+        logger.info("Models downloaded successfully")
         
     except Exception as e:
-        print(f"Error downloading models: {e}")
+        logger.error("Error downloading models: %s", e)
         raise
 
 @app.get("/health", response_model=HealthResponse)
@@ -135,19 +207,19 @@ async def health_check():
         gpu_available=torch.cuda.is_available(),
         gpu_name=torch.cuda.get_device_name(0) if torch.cuda.is_available() else None,
         vram_gb=torch.cuda.get_device_properties(0).total_memory / 1e9 if torch.cuda.is_available() else 0,
-        queue_size=len(video_queue),
+        queue_size=len(queued_jobs),
         uptime_seconds=uptime
     )
 
 @app.post("/generate-video", response_model=VideoResponse)
-async def generate_video(request: VideoRequest, background_tasks: BackgroundTasks):
+async def generate_video(request: VideoRequest):
     """Queue video generation request"""
-    
+
     video_id = str(uuid.uuid4())
-    
+
     # Calculate cost estimate
     cost_estimate = calculate_cost(request.duration_seconds, request.resolution)
-    
+
     # Create job
     job = {
         "video_id": video_id,
@@ -156,13 +228,11 @@ async def generate_video(request: VideoRequest, background_tasks: BackgroundTask
         "created_at": datetime.utcnow(),
         "cost_estimate": cost_estimate
     }
-    
-    # Add to queue
-    video_queue.append(job)
-    
-    # Start processing in background
-    background_tasks.add_task(process_video_queue)
-    
+
+    # Hand off to the worker task
+    queued_jobs[video_id] = job
+    await job_queue.put(job)
+
     return VideoResponse(
         video_id=video_id,
         status="queued",
@@ -197,13 +267,13 @@ async def get_video_status(video_id: str):
         )
     
     # Check queue
-    for job in video_queue:
-        if job["video_id"] == video_id:
-            return VideoResponse(
-                video_id=video_id,
-                status="queued",
-                cost_estimate=job["cost_estimate"]
-            )
+    if video_id in queued_jobs:
+        job = queued_jobs[video_id]
+        return VideoResponse(
+            video_id=video_id,
+            status="queued",
+            cost_estimate=job["cost_estimate"]
+        )
     
     raise HTTPException(status_code=404, detail="Video not found")
 
@@ -232,21 +302,29 @@ async def download_video(video_id: str):
 async def get_queue_status():
     """Get current queue status"""
     return {
-        "queue_size": len(video_queue),
+        "queue_size": len(queued_jobs),
         "processing": len(processing_jobs),
         "completed": len(completed_jobs)
     }
 
-async def process_video_queue():
-    """Background task to process video generation queue"""
-    if not video_queue or SKYREELS_MODEL is None:
-        return
-    
-    # Get next job
-    job = video_queue.pop(0)
+async def video_worker():
+    """Long-running worker that drains the generation queue serially"""
+    while True:
+        job = await job_queue.get()
+        try:
+            await process_video_job(job)
+        except Exception as e:
+            # Never let a job error kill the worker loop
+            logger.error("Worker error on %s: %s", job['video_id'], e)
+        finally:
+            job_queue.task_done()
+
+async def process_video_job(job):
+    """Process a single video generation job"""
     video_id = job["video_id"]
     request = job["request"]
-    
+    queued_jobs.pop(video_id, None)
+
     # Move to processing
     processing_jobs[video_id] = job
     job["status"] = "processing"
@@ -265,7 +343,7 @@ async def process_video_queue():
         job["duration_seconds"] = request.duration_seconds
         job["completed_at"] = datetime.utcnow()
         
-        print(f"Video {video_id} completed successfully")
+        logger.info("Video %s completed successfully", video_id)
         
     except Exception as e:
         # Mark as failed
@@ -273,7 +351,7 @@ async def process_video_queue():
         job["error_message"] = str(e)
         job["failed_at"] = datetime.utcnow()
         
-        print(f"Video {video_id} failed: {e}")
+        logger.error("Video %s failed: %s", video_id, e)
     
     finally:
         # Move from processing to completed
@@ -293,7 +371,7 @@ async def generate_with_skyreels(request: VideoRequest, video_id: str) -> str:
         "output_path": str(output_path)
     }
     
-    print(f"Generating video with SkyReels: {skyreels_params}")
+    logger.info("Generating video with SkyReels: %s", skyreels_params)
     
     # TODO: Replace with actual SkyReels V2 inference
     # video = SKYREELS_MODEL.generate(**skyreels_params)
@@ -312,18 +390,23 @@ async def upload_to_storage(video_path: str, video_id: str) -> str:
     
     # Check if S3 credentials are available
     try:
-        s3_client = boto3.client('s3')
-        bucket_name = os.getenv('S3_BUCKET_NAME', 'sysrai-videos')
-        
-        # Upload to S3
+        s3_client = get_s3_client()
+        bucket_name = S3_BUCKET_NAME
+
+        # Upload to S3 on a worker thread - a multi-hundred-MB film
+        # would otherwise stall the event loop (and every other
+        # request) for the duration of the transfer
         key = f"videos/{video_id}.mp4"
-        s3_client.upload_file(video_path, bucket_name, key)
+        await asyncio.to_thread(
+            s3_client.upload_file, video_path, bucket_name, key,
+            Config=S3_TRANSFER_CONFIG
+        )
         
         # Return public URL
         return f"https://{bucket_name}.s3.amazonaws.com/{key}"
         
     except (NoCredentialsError, Exception) as e:
-        print(f"Storage upload failed: {e}")
+        logger.warning("Storage upload failed: %s", e)
         # Return local file URL as fallback
         return f"/download/{video_id}"
 
@@ -346,18 +429,23 @@ async def shutdown_pod():
     
     # Save current state
     state = {
-        "video_queue": video_queue,
+        "video_queue": list(queued_jobs.values()),
         "processing_jobs": processing_jobs,
         "completed_jobs": completed_jobs,
         "shutdown_time": datetime.utcnow().isoformat()
     }
     
-    with open("/workspace/state.json", "w") as f:
-        json.dump(state, f, default=str)
+    if orjson is not None:
+        Path("/workspace/state.json").write_bytes(
+            orjson.dumps(state, default=str)
+        )
+    else:
+        with open("/workspace/state.json", "w") as f:
+            json.dump(state, f, default=str)
     
-    print("State saved. Pod ready for shutdown.")
+    logger.info("State saved. Pod ready for shutdown.")
     
-    return {"message": "Pod ready for shutdown", "jobs_saved": len(video_queue) + len(processing_jobs)}
+    return {"message": "Pod ready for shutdown", "jobs_saved": len(queued_jobs) + len(processing_jobs)}
 
 if __name__ == "__main__":
     import uvicorn
@@ -11,6 +11,8 @@ from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 import asyncio
 import numpy as np
 from moviepy import VideoFileClip, ImageClip, TextClip, CompositeVideoClip, concatenate_videoclips, AudioFileClip
@@ -75,7 +77,7 @@ class FilmScriptGenerator:
     def __init__(self, llm_client):
         self.llm = llm_client
         
-    def generate_film_structure(self, 
+    async def generate_film_structure(self,
                                source_content: str,
                                duration_minutes: int,
                                genre: str) -> Dict:
@@ -125,7 +127,13 @@ class FilmScriptGenerator:
         Output as structured JSON.
         """
         
-        return self.llm.generate_structure(prompt)
+        # Prefer the client's native async API; otherwise push the
+        # blocking round-trip onto a worker thread so the event loop
+        # keeps serving other requests during the multi-second LLM wait
+        agenerate = getattr(self.llm, 'agenerate_structure', None)
+        if agenerate is not None:
+            return await agenerate(prompt)
+        return await asyncio.to_thread(self.llm.generate_structure, prompt)
         
     def generate_storyboard(self, 
                            film_structure: Dict,
@@ -140,10 +148,13 @@ class FilmScriptGenerator:
                 
                 # Determine camera angles for the scene
                 camera_angles = self._determine_camera_angles(scene)
-                
+
+                # Everything but the camera angle is scene-invariant;
+                # build it once instead of re-deriving per panel
+                scene_suffix = self._scene_prompt_suffix(scene)
+                panel_duration = scene['duration'] // len(camera_angles)
+
                 for angle_num, camera_angle in enumerate(camera_angles):
-                    panel_duration = scene['duration'] // len(camera_angles)
-                    
                     panel = StoryboardPanel(
                         panel_id=f"A{act_num}S{scene_num}P{angle_num}",
                         scene_number=scene_num,
@@ -153,7 +164,10 @@ class FilmScriptGenerator:
                         dialogue=scene.get('dialogue'),
                         sound_effects=scene.get('sound_effects', []),
                         music_cue=scene.get('music_cue'),
-                        visual_prompt=self._create_visual_prompt(scene, camera_angle, style),
+                        visual_prompt=(
+                            f"FPS-24, {style} cinematic quality, "
+                            f"{camera_angle.value}{scene_suffix}"
+                        ),
                         transition_type=scene.get('transition', 'cut'),
                         is_chapter_end=scene.get('chapter_end', False),
                         is_commercial_break=scene.get('commercial_break', False)
@@ -194,19 +208,25 @@ class FilmScriptGenerator:
             
         return angles
         
-    def _create_visual_prompt(self, scene: Dict, camera_angle: CameraAngle, style: str) -> str:
-        """Create detailed visual prompt for SkyReels"""
-        
-        base_prompt = f"FPS-24, {style} cinematic quality, {camera_angle.value}"
+    def _scene_prompt_suffix(self, scene: Dict) -> str:
+        """Camera-independent tail of a scene's visual prompt
+
+        generate_storyboard emits one panel per camera angle; the
+        description/mood/lighting portion is identical across them, so
+        callers compute this once per scene.
+        """
+
         scene_prompt = f"{scene['description']}. {scene.get('visual_details', '')}"
-        
-        # Add lighting and mood
         mood = scene.get('mood', 'neutral')
         lighting = scene.get('lighting', 'natural')
-        
-        full_prompt = f"{base_prompt}. {scene_prompt}. {mood} mood, {lighting} lighting"
-        
-        return full_prompt
+
+        return f". {scene_prompt}. {mood} mood, {lighting} lighting"
+
+    def _create_visual_prompt(self, scene: Dict, camera_angle: CameraAngle, style: str) -> str:
+        """Create detailed visual prompt for SkyReels"""
+
+        return (f"FPS-24, {style} cinematic quality, {camera_angle.value}"
+                f"{self._scene_prompt_suffix(scene)}")
 
 
 class FilmVideoGenerator:
@@ -225,19 +245,30 @@ class FilmVideoGenerator:
         
         # Group panels by continuous sequences
         sequences = self._group_into_sequences(storyboard)
-        
-        # Generate each sequence
-        sequence_files = []
-        for seq_num, sequence in enumerate(sequences, 1):
-            print(f"Generating sequence {seq_num}/{len(sequences)}...")
-            
-            video_file = await self._generate_sequence(sequence, project)
-            sequence_files.append(video_file)
-            
-            # Add scene marker if needed
-            if sequence[-1].is_chapter_end or sequence[-1].is_commercial_break:
-                self.scene_markers.append(len(sequence_files))
-                
+
+        # Semaphore-gated fan-out: a steady window of 3 sequences
+        # renders at once, so fast sequences don't wait on the slowest
+        # member of a fixed batch. gather preserves input order, so
+        # assembly order is unchanged.
+        semaphore = asyncio.Semaphore(3)
+
+        async def generate_one(seq_num: int, sequence) -> str:
+            async with semaphore:
+                print(f"Generating sequence {seq_num}/{len(sequences)}...")
+                return await self._generate_sequence(sequence, project)
+
+        sequence_files = list(await asyncio.gather(
+            *(generate_one(seq_num, sequence)
+              for seq_num, sequence in enumerate(sequences, 1))
+        ))
+
+        # Markers derive from sequence order, not completion order
+        self.scene_markers = [
+            seq_num for seq_num, sequence in enumerate(sequences, 1)
+            if sequence[-1].is_chapter_end or sequence[-1].is_commercial_break
+        ]
+
+
         # Combine all sequences into full film
         full_film_path = await self._assemble_full_film(sequence_files, project)
         
@@ -527,7 +558,16 @@ class PricingEngine:
         'rush_multiplier': 2.0,         # 2x for rush jobs
         'premium_quality': 1.5,         # 1.5x for premium quality
     }
-    
+
+    # Integer-cents mirror of BASE_RATES for the cost hot path - exact
+    # arithmetic with no float rounding drift, converted to dollars
+    # only at the boundary
+    _SCRIPT_CENTS = 100
+    _VIDEO_CENTS = 300
+    _STORYBOARD_CENTS = 1000
+    _PREMIUM_FEE_PCT = 50   # +50% of subtotal
+    _RUSH_FEE_PCT = 100     # +100% of subtotal
+
     GPU_COSTS = {
         'rtx4090': 0.44,    # per hour
         'a100_40gb': 0.66,   # per hour
@@ -536,51 +576,52 @@ class PricingEngine:
     }
     
     @classmethod
-    def calculate_project_cost(cls, 
+    @lru_cache(maxsize=4096)
+    def calculate_project_cost(cls,
                               duration_minutes: int,
                               include_script: bool = True,
                               include_storyboard: bool = True,
                               quality: str = "standard",
                               rush: bool = False) -> Dict:
-        """Calculate total cost for a project"""
-        
-        costs = {
-            'video_generation': duration_minutes * cls.BASE_RATES['video_per_minute'],
-            'script_writing': 0,
-            'storyboarding': 0,
-            'subtotal': 0,
-            'rush_fee': 0,
-            'quality_fee': 0,
-            'total': 0,
-            'profit_margin': 0,
-            'gpu_cost_estimate': 0
-        }
-        
-        if include_script:
-            costs['script_writing'] = duration_minutes * cls.BASE_RATES['script_per_minute']
-            
-        if include_storyboard:
-            costs['storyboarding'] = cls.BASE_RATES['storyboard_flat']
-            
-        costs['subtotal'] = (costs['video_generation'] + 
-                             costs['script_writing'] + 
-                             costs['storyboarding'])
-        
-        if quality == "premium":
-            costs['quality_fee'] = costs['subtotal'] * (cls.BASE_RATES['premium_quality'] - 1)
-            
-        if rush:
-            costs['rush_fee'] = costs['subtotal'] * (cls.BASE_RATES['rush_multiplier'] - 1)
-            
-        costs['total'] = costs['subtotal'] + costs['quality_fee'] + costs['rush_fee']
-        
+        """Calculate total cost for a project
+
+        Pure function of a tiny input space (small int, bools, short
+        enums), so quotes are memoized; the returned mapping is
+        read-only because cache hits share one instance.
+        """
+
+        # Branchless fold: bools multiply line items in or out, and all
+        # money stays in integer cents until the output dict
+        video_cents = duration_minutes * cls._VIDEO_CENTS
+        script_cents = duration_minutes * cls._SCRIPT_CENTS * include_script
+        storyboard_cents = cls._STORYBOARD_CENTS * include_storyboard
+        subtotal_cents = video_cents + script_cents + storyboard_cents
+
+        quality_fee_cents = (
+            subtotal_cents * cls._PREMIUM_FEE_PCT * (quality == "premium") // 100
+        )
+        rush_fee_cents = subtotal_cents * cls._RUSH_FEE_PCT * rush // 100
+        total_cents = subtotal_cents + quality_fee_cents + rush_fee_cents
+
         # Estimate GPU costs (roughly 1 minute GPU time per 5 minutes of video)
         gpu_hours = (duration_minutes / 5) / 60
-        costs['gpu_cost_estimate'] = gpu_hours * cls.GPU_COSTS['a100_40gb']
-        costs['profit_margin'] = costs['total'] - costs['gpu_cost_estimate']
-        costs['profit_percentage'] = (costs['profit_margin'] / costs['total']) * 100
-        
-        return costs
+        gpu_cost = gpu_hours * cls.GPU_COSTS['a100_40gb']
+
+        total = total_cents / 100
+        profit_margin = total - gpu_cost
+
+        return MappingProxyType({
+            'video_generation': video_cents / 100,
+            'script_writing': script_cents / 100,
+            'storyboarding': storyboard_cents / 100,
+            'subtotal': subtotal_cents / 100,
+            'rush_fee': rush_fee_cents / 100,
+            'quality_fee': quality_fee_cents / 100,
+            'total': total,
+            'gpu_cost_estimate': gpu_cost,
+            'profit_margin': profit_margin,
+            'profit_percentage': (profit_margin / total) * 100
+        })
         
     @classmethod
     def calculate_break_even(cls, monthly_users: int, avg_duration: int = 30) -> Dict:
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Page object models for the Sysrai test suite
+Centralizes selectors and URL fragments repeated across tests
+"""
+
+from typing import Dict
+
+from playwright.async_api import Page
+
+
+async def fill_form(page: Page, fields: Dict[str, str]):
+    """Fill several named inputs in a single CDP roundtrip"""
+
+    # One evaluate instead of one page.fill per field; dispatch the
+    # events frameworks listen for so validation still fires
+    await page.evaluate(
+        """
+        (fields) => {
+            for (const [name, value] of Object.entries(fields)) {
+                const el = document.querySelector(`input[name='${name}']`);
+                if (!el) continue;
+                el.value = value;
+                el.dispatchEvent(new Event('input', { bubbles: true }));
+                el.dispatchEvent(new Event('change', { bubbles: true }));
+            }
+        }
+        """,
+        fields
+    )
+
+
+class BasePage:
+    """Common navigation helpers shared by all page objects"""
+
+    url_path = "/"
+
+    def __init__(self, page: Page, base_url: str):
+        self.page = page
+        self.base_url = base_url
+
+    async def goto(self):
+        await self.page.goto(f"{self.base_url}{self.url_path}")
+
+
+class RegisterPage(BasePage):
+    """Registration form"""
+
+    url_path = "/register"
+
+    def __init__(self, page: Page, base_url: str):
+        super().__init__(page, base_url)
+        # Locators are lazy and memoized - repeated use skips re-resolution
+        self.submit_button = page.locator('button[type="submit"]')
+        self.welcome_message = page.locator('.welcome-message')
+
+    async def register(self, user: Dict[str, str]):
+        await fill_form(self.page, {
+            "email": user["email"],
+            "password": user["password"],
+            "confirm_password": user["password"],
+            "name": user["name"]
+        })
+        await self.submit_button.click()
+
+
+class LoginPage(BasePage):
+    """Login form"""
+
+    url_path = "/login"
+
+    def __init__(self, page: Page, base_url: str):
+        super().__init__(page, base_url)
+        self.email = page.locator('input[name="email"]')
+        self.submit_button = page.locator('button[type="submit"]')
+
+    async def login(self, email: str, password: str):
+        await fill_form(self.page, {"email": email, "password": password})
+        await self.submit_button.click()
+
+
+class DashboardPage(BasePage):
+    """Main dashboard after login"""
+
+    url_path = "/dashboard"
+
+    def __init__(self, page: Page, base_url: str):
+        super().__init__(page, base_url)
+        self.credits_balance = page.locator('.credits-balance')
+        self.create_project_button = page.locator('.create-project-btn')
+        self.recent_projects = page.locator('.recent-projects')